@@ -164,13 +164,7 @@ class GCState(ConnectionState, Generic[Inv]):
 
     async def fetch_backpack(self, backpack_cls: type[Inv]) -> Inv:
         app = APP.get()
-        try:
-            lock = self.user._inventory_locks[app.id]
-        except KeyError:
-            lock = self.user._inventory_locks[app.id] = asyncio.Lock()
-
-        async with lock:  # requires a per-app lock to avoid Result.DuplicateRequest
-            resp = await self.fetch_user_inventory(self.user.id64, app.id, ContextID(2), self.language)
+        resp = await self.fetch_user_inventory(self.user.id64, app.id, ContextID(2), self.language)
         backpack = backpack_cls(
             state=self, proto=resp, owner=self.user, app=app, context_id=ContextID(2), language=self.language
         )
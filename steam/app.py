@@ -425,6 +425,7 @@ class AppShopItem(DescriptionMixin):
         tags: Sequence[AppShopItemTag],
     ):
         self._state = state
+        self._app_id = AppID(description.appid)
         self.class_id = ClassID(description.classid)
         self.def_index = int(data["name"])
         """The def index of the item in the app's schema"""
@@ -1257,7 +1257,10 @@ class Client:
             if not total:
                 return []
 
-            descriptions = data.get("descriptions", ())
+            descriptions = {
+                (description["classid"], description["instanceid"]): description
+                for description in data.get("descriptions", ())
+            }
             trades = [
                 TradeOffer._from_history(self._state, trade, descriptions)
                 for trade in data.get("trades", ())
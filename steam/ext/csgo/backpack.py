@@ -12,7 +12,7 @@ from typing_extensions import Self, TypeVar
 
 from ... import utils
 from ...abc import BaseUser
-from ...trade import Inventory, Item
+from ...trade import Asset, Inventory, Item
 from ...types.id import AssetID
 from .enums import (
     ItemCustomizationNotification as ItemCustomizationNotificationEnum,
@@ -226,15 +226,15 @@ if TYPE_CHECKING:  # avoid mro issues but keep types
     class BaseBackpackItem(Item[OwnerT], BaseItem):
         __slots__ = ()
 
-else:
+else:  # the slots shared with Asset are dropped so they aren't shadowed by a second, unused descriptor
 
     @BaseInspectedItem.register
     class InspectedItem(Item[OwnerT]):
-        __slots__ = BaseInspectedItem.__slots__
+        __slots__ = tuple(slot for slot in BaseInspectedItem.__slots__ if slot not in Asset.__slots__)
 
     @BaseItem.register
     class BaseBackpackItem(Item[OwnerT]):
-        __slots__ = BaseItem.__slots__
+        __slots__ = tuple(slot for slot in BaseItem.__slots__ if slot not in Asset.__slots__)
 
 
 F = TypeVar("F", bound=Callable[..., object])
@@ -424,6 +424,8 @@ class _FakeNameTag(BackpackItem["ClientUser"]):
 class Backpack(Inventory[BackpackItem["ClientUser"], "ClientUser"]):
     """A class to represent the client's backpack."""
 
+    __slots__ = ()
+
     @property
     def caskets(self) -> Sequence[Casket]:
         """The caskets in this backpack."""
@@ -120,9 +120,10 @@ class GCState(GCState_[Backpack]):
 
         backpack = self.backpack or await self.fetch_backpack(Backpack)
 
+        items = {item.id: item for item in backpack}  # avoid a linear scan of the backpack for every gc item
         gc_item: base.Item | CasketItem
         for gc_item in gc_items:  # merge the two items
-            item = utils.get(backpack, id=gc_item.id)
+            item = items.get(gc_item.id)
             is_casket_item = False
             if item is None:
                 # is the item contained in a casket?
@@ -258,10 +259,12 @@ class GCState(GCState_[Backpack]):
             return
 
         deleted_item = base.Item().parse(msg.object_data)
-        item = utils.get(self.backpack, id=deleted_item.id)
-        if item is None:
+        for idx, item in enumerate(self.backpack):
+            if item.id == deleted_item.id:
+                break
+        else:
             return log.info("Received an item that isn't our inventory %r", deleted_item)
         for attribute_name in deleted_item.__annotations__:
             setattr(item, attribute_name, getattr(deleted_item, attribute_name))
-        self.backpack.items.remove(item)  # type: ignore
+        del self.backpack.items[idx]  # type: ignore
         self.dispatch("item_remove", item)
@@ -93,22 +93,23 @@ class GCState(GCState_[Backpack]):
         await self.client.wait_until_ready()
 
         backpack = self.backpack or await self.fetch_backpack(Backpack)
-        item_ids = [item.id for item in backpack]
+        items = {item.id: item for item in backpack}
 
-        if any(cso_item.id not in item_ids for cso_item in cso_items):
+        if any(cso_item.id not in items for cso_item in cso_items):
             try:
                 await backpack.update()
             except HTTPException:
                 pass
 
-            item_ids = [item.id for item in backpack]
+            items = {item.id: item for item in backpack}
 
-            if any(cso_item.id not in item_ids for cso_item in cso_items):
+            if any(cso_item.id not in items for cso_item in cso_items):
                 await self.restart_tf2()
                 await backpack.update()  # if the item still isn't here something on valve's end has broken
+                items = {item.id: item for item in backpack}
 
         for cso_item in cso_items:  # merge the two items
-            item = utils.get(backpack, id=cso_item.id)
+            item = items.get(cso_item.id)
             if item is None:
                 continue  # the item has been removed (gc sometimes sends you items that you have crafted/deleted)
             for attribute_name in cso_item.__annotations__:
@@ -197,10 +198,12 @@ class GCState(GCState_[Backpack]):
             return
 
         deleted_item = base.Item().parse(msg.object_data)
-        item = utils.get(self.backpack, id=deleted_item.id)
-        if item is None:  # broken item
+        for idx, item in enumerate(self.backpack):
+            if item.id == deleted_item.id:
+                break
+        else:  # broken item
             return
         for attribute_name in deleted_item.__annotations__:
             setattr(item, attribute_name, getattr(deleted_item, attribute_name))
-        self.backpack.items.remove(item)  # type: ignore
+        del self.backpack.items[idx]  # type: ignore
         self.dispatch("item_remove", item)
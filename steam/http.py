@@ -14,6 +14,7 @@ from time import time
 from typing import TYPE_CHECKING, Any, Literal, TypeVar, cast
 
 import aiohttp
+from aiohttp.client import DEFAULT_TIMEOUT
 from bs4 import BeautifulSoup
 from yarl import URL as URL_
 
@@ -40,14 +41,13 @@ T = TypeVar("T")
 log = logging.getLogger(__name__)
 
 
-async def json_or_text(r: aiohttp.ClientResponse, *, loads: Callable[[str], Any] = JSON_LOADS) -> Any:
-    text = await r.text()
+async def json_or_text(r: aiohttp.ClientResponse, *, loads: Callable[[bytes], Any] = JSON_LOADS) -> Any:
     try:
         if "application/json" in r.headers["Content-Type"]:
-            return loads(text)
+            return loads(await r.read())  # parse the raw body, decoding it to a str first is just extra work
     except KeyError:
         pass
-    return text
+    return await r.text()
 
 
 class HTTPClient:
@@ -73,7 +73,9 @@ class HTTPClient:
 
     def clear(self) -> None:
         self._session = aiohttp.ClientSession(
-            connector=self.connector,
+            connector=self.connector
+            or aiohttp.TCPConnector(ttl_dns_cache=300),  # almost all requests go to a handful of hosts
+            timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT.total, sock_connect=10),  # fail fast on connecting
             json_serialize=JSON_DUMPS,
         )
 
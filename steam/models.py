@@ -363,7 +363,6 @@ class DescriptionMixin(Protocol):
         """The owner actions for the item."""
         self.market_actions = description.market_actions
         """The market actions for the item."""
-        self._app_id = AppID(description.appid)
         self._market_fee_app_id = AppID(description.market_fee_app)
         self._is_tradable = description.tradable
         self._is_marketable = description.marketable
@@ -391,13 +390,9 @@ class DescriptionMixin(Protocol):
     @property
     def app(self) -> PartialApp[None]:
         """The app the item is from."""
-        from .app import PartialApp
-
-        return PartialApp(self._state, id=self._app_id)
+        return self._state.get_partial_app(self._app_id)
 
     @property
     def market_fee_app(self) -> PartialApp[None]:
         """The app for which the Steam Community Market fee percentage is applied."""
-        from .app import PartialApp
-
-        return PartialApp(self._state, id=self._market_fee_app_id)
+        return self._state.get_partial_app(self._market_fee_app_id)
@@ -7,7 +7,7 @@ Licensed under The MIT License (MIT) - Copyright (c) 2020-present James H-B. See
 """
 
 from collections.abc import Mapping
-from typing import TYPE_CHECKING, Final, TypeAlias, cast
+from typing import TYPE_CHECKING, Any, Final, TypeAlias, cast
 
 import betterproto
 
@@ -74,5 +74,16 @@ from . import (
     user_stats as user_stats,
 )
 
-[setattr(cls, "_betterproto", betterproto.ProtoClassMetadata(cls)) for cls in ProtobufMessage.__subclasses__()]
-[setattr(cls, "_betterproto", betterproto.ProtoClassMetadata(cls)) for cls in UnifiedMessage.__subclasses__()]
+
+class _ClassMetadata:
+    # betterproto looks its class metadata up through a property on every access, so the first time a message's
+    # metadata is needed store it directly on the class. Doing this eagerly for every message at import time was a
+    # large chunk of the time spent importing steam.
+    def __get__(self, instance: betterproto.Message | None, owner: type[betterproto.Message]) -> Any:
+        meta = betterproto.ProtoClassMetadata(owner)
+        if instance is not None:  # only cache on classes that are actually instantiated, not the bases
+            owner._betterproto = meta  # type: ignore
+        return meta
+
+
+ProtobufMessage._betterproto = _ClassMetadata()  # type: ignore
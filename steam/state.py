@@ -7,14 +7,16 @@ import collections
 import functools
 import inspect
 import logging
+import math
 import random
+import time
 import weakref
 from collections import defaultdict, deque
 from collections.abc import AsyncGenerator, Callable, Iterable, Sequence
 from contextlib import asynccontextmanager
 from copy import copy
 from datetime import datetime, timedelta
-from itertools import count
+from itertools import chain, count
 from operator import attrgetter
 from typing import TYPE_CHECKING, Any, Final, Generic, Protocol, TypeVar, cast, get_args
 from zlib import crc32
@@ -24,7 +26,7 @@ from yarl import URL as URL_
 from . import utils
 from ._const import JSON_LOADS, READ_U32, URL, VDF_BINARY_LOADS, VDF_LOADS, TaskGroup, timeout
 from .abc import Awardable, Commentable, PartialUser, _CommentThreadType
-from .app import App, AuthenticationTicket, FetchedApp
+from .app import App, AuthenticationTicket, FetchedApp, PartialApp
 from .bundle import FetchedBundle
 from .clan import Clan, ClanMember, PartialClan
 from .comment import Comment
@@ -83,7 +85,7 @@ from .reaction import (
     _Reaction,
 )
 from .role import Role, RolePermissions
-from .trade import Item, TradeOffer
+from .trade import ACTIVE_STATES, Item, TradeOffer
 from .types.id import *
 from .user import ClientUser, User
 from .utils import DateTime, cached_property, call_once
@@ -104,34 +106,55 @@ if TYPE_CHECKING:
 
 log = logging.getLogger(__name__)
 
+USER_CACHE_TTL: Final = 300  # seconds a trade partner is kept alive for in ConnectionState._users
+USER_CACHE_SIZE: Final = 1024
+TRADE_QUEUE_TTL: Final = 600  # seconds an offer nobody has waited for is kept in ConnectionState.trade_queue
+
 T = TypeVar("T")
 OwnerT = TypeVar("OwnerT", bound=Commentable)
 
 
 class Queue(Generic[T]):
-    def __init__(self, attr: attrgetter[int] = attrgetter("id")) -> None:
-        self.queue: list[T] = []
+    def __init__(self, attr: attrgetter[int] = attrgetter("id"), ttl: float | None = None) -> None:
+        self.queue: deque[tuple[float, T]] = deque()  # (expires, item) in insertion order, so also in expiry order
         self.attr = attr
+        self.ttl = ttl
         self._waiting_for: dict[int, asyncio.Future[T]] = {}
 
-    async def wait_for(self, id: int) -> T:
-        for item in reversed(self.queue):  # check if it's already here
+    def _expire(self) -> None:
+        queue = self.queue
+        now = time.monotonic()
+        while queue and queue[0][0] < now:
+            queue.popleft()
+
+    def _pop(self, id: int) -> T | None:
+        queue = self.queue
+        for idx, (_, item) in enumerate(reversed(queue)):  # newest first
             if self.attr(item) == id:
-                self.queue.remove(item)
+                del queue[len(queue) - 1 - idx]
                 return item
 
+    async def wait_for(self, id: int) -> T:
+        item = self._pop(id)  # check if it's already here
+        if item is not None:
+            return item
+
         self._waiting_for[id] = future = asyncio.get_running_loop().create_future()
         item = await future
-        self.queue.remove(item)
+        self._pop(id)  # it's been handed over, no need to keep it around
         return item
 
     def __len__(self) -> int:
         return len(self.queue)
 
     def __iadd__(self, other: Iterable[T]) -> Self:
-        self.queue += other
+        if self.ttl is not None:
+            self._expire()
+        items = list(other)
+        expires = time.monotonic() + self.ttl if self.ttl is not None else math.inf
+        self.queue += ((expires, item) for item in items)
 
-        for item in other:
+        for item in items:
             attr = self.attr(item)
             try:
                 future = self._waiting_for[attr]
@@ -213,6 +236,12 @@ class ConnectionState:
 
     def clear(self) -> None:
         self._users = weakref.WeakValueDictionary[ID32, User]()
+        if (expiry := getattr(self, "_trade_partners_expiry", None)) is not None:  # clear() is also called on login
+            expiry.cancel()
+        self._recent_trade_partners: dict[ID32, tuple[float, User]] = {}
+        self._trade_partners_expiry: asyncio.TimerHandle | None = None
+
+        self._partial_apps: dict[AppID, PartialApp[None]] = {}  # shared between items so they don't each create one
 
         self._groups: dict[ChatGroupID, Group] = {}
         self._clans: dict[ID32, Clan] = {}
@@ -228,8 +257,13 @@ class ConnectionState:
         self._trades: dict[TradeOfferID, TradeOffer[Item[User], Item[ClientUser], User]] = {}
         self._confirmations: dict[TradeOfferID, Confirmation] = {}
         self.confirmation_generation_locks = defaultdict[Tags, asyncio.Lock](asyncio.Lock)
-        self.trade_queue = Queue[TradeOffer[Item[User], Item[ClientUser], User]]()
+        # only needs to bridge the gap between an offer being seen and wait_for_trade being called for it (e.g. whilst
+        # a sent offer is being confirmed), don't hold onto every offer ever polled
+        self.trade_queue = Queue[TradeOffer[Item[User], Item[ClientUser], User]](ttl=TRADE_QUEUE_TTL)
         self._trades_to_watch: set[TradeOfferID] = set()
+        self._inventory_requests: dict[
+            tuple[ID64, AppID, ContextID, Language], asyncio.Future[econ.GetInventoryItemsWithDescriptionsResponse]
+        ] = {}
         self.polling_confirmations = False
         self.confirmation_queue = Queue[Confirmation](attr=attrgetter("creator_id"))
 
@@ -316,6 +350,13 @@ class ConnectionState:
     def get_partial_user(self, id: Intable) -> PartialUser:
         return PartialUser(self, id)
 
+    def get_partial_app(self, id: AppID) -> PartialApp[None]:
+        try:
+            return self._partial_apps[id]
+        except KeyError:
+            app = self._partial_apps[id] = PartialApp(self, id=id)
+            return app
+
     def get_user(self, id: ID32) -> User | None:
         return self._users.get(id)
 
@@ -327,6 +368,39 @@ class ConnectionState:
         users = await self.ws.fetch_users(user_id64s)
         return [self._store_user(user) for user in users]
 
+    def _keep_trade_partners_alive(self, users: Iterable[User]) -> None:
+        # hold strong references to trade partners for a while so the same partner across polls is served from _users
+        # instead of being garbage collected and re-fetched
+        recent = self._recent_trade_partners
+        expires = time.monotonic() + USER_CACHE_TTL
+        for user in users:
+            recent.pop(user.id, None)  # re-insert so the dict stays ordered by expiry
+            recent[user.id] = (expires, user)
+        while len(recent) > USER_CACHE_SIZE:
+            del recent[next(iter(recent))]
+        if self._trade_partners_expiry is None:
+            self._trade_partners_expiry = asyncio.get_running_loop().call_later(
+                USER_CACHE_TTL, self._expire_trade_partners
+            )
+
+    def _expire_trade_partners(self) -> None:
+        recent = self._recent_trade_partners
+        now = time.monotonic()
+        expired: list[ID32] = []
+        for id, (expires, _) in recent.items():
+            if expires > now:
+                break
+            expired.append(id)
+        for id in expired:
+            del recent[id]
+
+        self._trade_partners_expiry = None
+        if recent:  # check back when the next one is due
+            expires, _ = next(iter(recent.values()))
+            self._trade_partners_expiry = asyncio.get_running_loop().call_later(
+                expires - now, self._expire_trade_partners
+            )
+
     async def _maybe_user(self, id: Intable) -> User:
         steam_id = ID(id, type=Type.Individual)
         return self.get_user(steam_id.id) or await self.fetch_user(steam_id.id64)
@@ -823,7 +897,55 @@ class ConnectionState:
         await self._block_user(user_id64, False)
 
     async def fetch_user_inventory(
-        self, user_id64: ID64, app_id: AppID, context_id: ContextID, language: Language | None
+        self, user_id64: ID64, app_id: AppID, context_id: ContextID, language: Language | None, *, fresh: bool = False
+    ) -> econ.GetInventoryItemsWithDescriptionsResponse:
+        # coalesce concurrent requests for the same inventory into one, Steam would reject the duplicates anyway.
+        # fresh requests (re-fetches) can't use a response that was requested before they were made so always start a
+        # new one, later requests can then join that instead
+        key = (user_id64, app_id, context_id, language or self.language)
+        requests = self._inventory_requests
+        future = None if fresh else requests.get(key)
+        if future is None:
+            future = requests[key] = asyncio.get_running_loop().create_future()
+
+            def remove(future: asyncio.Future[Any]) -> None:  # captures requests in case clear() swaps it out
+                if requests.get(key) is future:  # a fresh request might have taken its place
+                    del requests[key]
+
+            future.add_done_callback(remove)
+            self._tg.create_task(self._resolve_inventory_request(future, key))
+        return await asyncio.shield(future)
+
+    async def _resolve_inventory_request(
+        self,
+        future: asyncio.Future[econ.GetInventoryItemsWithDescriptionsResponse],
+        key: tuple[ID64, AppID, ContextID, Language],
+    ) -> None:
+        # this runs in the client's task group so it mustn't raise, the callers waiting on future get the error instead
+        try:
+            future.set_result(await self._fetch_user_inventory(*key))
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+
+    async def _fetch_user_inventory(
+        self, user_id64: ID64, app_id: AppID, context_id: ContextID, language: Language
+    ) -> econ.GetInventoryItemsWithDescriptionsResponse:
+        if user_id64 != self.user.id64:
+            return await self._paginate_user_inventory(user_id64, app_id, context_id, language)
+
+        try:
+            lock = self.user._inventory_locks[app_id]
+        except KeyError:
+            lock = self.user._inventory_locks[app_id] = asyncio.Lock()
+
+        async with lock:  # requires a per-app lock to avoid Result.DuplicateRequest
+            return await self._paginate_user_inventory(user_id64, app_id, context_id, language)
+
+    async def _paginate_user_inventory(
+        self, user_id64: ID64, app_id: AppID, context_id: ContextID, language: Language
     ) -> econ.GetInventoryItemsWithDescriptionsResponse:
         more_items = True
         original_msg = None
@@ -835,7 +957,7 @@ class ConnectionState:
                     appid=app_id,
                     contextid=context_id,
                     get_descriptions=True,
-                    language=(language or self.language).api_name,
+                    language=language.api_name,
                     count=2000,
                     start_assetid=start_asset_id,
                 )
@@ -1638,18 +1760,22 @@ class ConnectionState:
         for trade_ in trades_:
             id = TradeOfferID(int(trade_["tradeofferid"]))
             user = trade_["accountid_other"]
+            items_to_receive = trade_.get("items_to_receive", ())
+            items_to_give = trade_.get("items_to_give", ())
+            receiving_assets = [econ.Asset().from_dict(asset) for asset in items_to_receive]
+            sending_assets = [econ.Asset().from_dict(asset) for asset in items_to_give]
             try:
                 receiving = [
-                    (econ.Asset().from_dict(asset), descriptions[asset["classid"], asset["instanceid"]])
-                    for asset in trade_.get("items_to_receive", ())
+                    (proto, descriptions[asset["classid"], asset["instanceid"]])
+                    for proto, asset in zip(receiving_assets, items_to_receive)
                 ]
                 sending = [
-                    (econ.Asset().from_dict(asset), descriptions[asset["classid"], asset["instanceid"]])
-                    for asset in trade_.get("items_to_give", ())
+                    (proto, descriptions[asset["classid"], asset["instanceid"]])
+                    for proto, asset in zip(sending_assets, items_to_give)
                 ]
-            except KeyError:
-                receiving = [econ.Asset().from_dict(asset) for asset in trade_.get("items_to_receive", ())]
-                sending = [econ.Asset().from_dict(asset) for asset in trade_.get("items_to_give", ())]
+            except KeyError:  # don't re-parse the assets if a description is missing
+                receiving = receiving_assets
+                sending = sending_assets
 
             try:
                 trade = self._trades[id]
@@ -1663,9 +1789,7 @@ class ConnectionState:
                     receiving=cast("list[tuple[econ.Asset, econ.ItemDescription]]", receiving),
                 )
                 self._trades[id] = trade
-                if trade.state in (TradeOfferState.Active, TradeOfferState.ConfirmationNeed) and (
-                    trade.sending or trade.receiving
-                ):  # could be glitched
+                if trade.state in ACTIVE_STATES and (trade.sending or trade.receiving):  # could be glitched
                     dispatch.append(("trade", trade))
                     self._trades_to_watch.add(trade.id)
             else:
@@ -1684,6 +1808,8 @@ class ConnectionState:
                     item.owner = user
             trade.user = user
 
+        self._keep_trade_partners_alive(trade.user for trade in trades)
+
         for args in dispatch:
             self.dispatch(*args)
 
@@ -1711,8 +1837,9 @@ class ConnectionState:
             (description["classid"], description["instanceid"]): econ.ItemDescription().from_dict(description)
             for description in trades.get("descriptions", ())
         }
-        self.trade_queue += await self._process_trades(trades.get("trade_offers_received", ()), descriptions)
-        self.trade_queue += await self._process_trades(trades.get("trade_offers_sent", ()), descriptions)
+        self.trade_queue += await self._process_trades(
+            chain(trades.get("trade_offers_received", ()), trades.get("trade_offers_sent", ())), descriptions
+        )
 
     async def wait_for_trade(self, id: TradeOfferID) -> TradeOffer[Item[User], Item[ClientUser], User]:
         self._trades_to_watch.add(id)
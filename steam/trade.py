@@ -2,16 +2,12 @@
 
 from __future__ import annotations
 
-import asyncio
-import contextlib
-import itertools
 import types
-from collections.abc import Iterator, Sequence
-from typing import TYPE_CHECKING, Any, Generic, cast, overload
+from collections.abc import Iterator, Mapping, Sequence
+from typing import TYPE_CHECKING, Any, Final, Generic, Literal, TypeAlias, cast, overload
 
 from typing_extensions import NamedTuple, TypeVar, get_original_bases
 
-from . import utils
 from ._const import URL
 from .app import App, PartialApp
 from .enums import Language, TradeOfferState
@@ -281,30 +277,33 @@ class Inventory(Generic[ItemT, OwnerT], Sequence[ItemT]):
         return item in self.items
 
     def _update(self, proto: econ.GetInventoryItemsWithDescriptionsResponse) -> None:
-        items: list[ItemT] = []
-        ItemClass: type[ItemT]
-        try:  # ideally one day this will just be ItemT.__value__ or something
-            ItemClass, *_ = self.__orig_class__.__args__
-        except AttributeError:
-            ItemClass = get_original_bases(self.__class__)[0].__args__[0].__default__
-        for asset in proto.assets:
-            description = utils.get(proto.descriptions, instanceid=asset.instanceid, classid=asset.classid)
-            if description is None:
-                raise RuntimeError(f"Associated description for {asset} not found")
-            items.append(ItemClass(self._state, asset=asset, description=description, owner=self.owner))
+        assets = proto.assets
+        items: list[ItemT] = [None] * len(assets)  # type: ignore  # filled in below
+        if assets:  # empty inventories don't need their descriptions indexing
+            ItemClass: type[ItemT]
+            try:  # ideally one day this will just be ItemT.__value__ or something
+                ItemClass, *_ = self.__orig_class__.__args__
+            except AttributeError:
+                ItemClass = get_original_bases(self.__class__)[0].__args__[0].__default__
+            descriptions = {
+                (description.classid, description.instanceid): description for description in proto.descriptions
+            }
+            state = self._state
+            owner = self.owner
+            for idx, asset in enumerate(assets):
+                try:
+                    description = descriptions[asset.classid, asset.instanceid]
+                except KeyError:
+                    raise RuntimeError(f"Associated description for {asset} not found") from None
+                items[idx] = ItemClass(state, asset=asset, description=description, owner=owner)
         self.items: Sequence[ItemT] = items
         """A list of the inventory's items."""
 
     async def update(self) -> None:
         """Re-fetches the inventory and updates it inplace."""
-        async with (
-            self._state.user._inventory_locks.setdefault(self.app.id, asyncio.Lock())
-            if self.owner == self._state.user
-            else contextlib.nullcontext()
-        ):
-            proto = await self._state.fetch_user_inventory(
-                self.owner.id64, self.app.id, self.context_id, self._language
-            )
+        proto = await self._state.fetch_user_inventory(
+            self.owner.id64, self.app.id, self.context_id, self._language, fresh=True
+        )
         self._update(proto)
 
 
@@ -329,21 +328,26 @@ class MovedItem(Item[OwnerT]):
             description=econ.ItemDescription().from_dict(data),
             owner=owner,
         )
-        try:
-            self.new_id = AssetID(
-                int(data["new_assetid"]) if "new_assetid" in data else int(data["rollback_new_assetid"])
-            )
-            """The new_assetid field, this is the asset ID of the item in the partners inventory."""
-        except KeyError:
-            self.new_id = AssetID(-1)  # steam broke?
+        new_id = data.get("new_assetid") or data.get("rollback_new_assetid")
+        self.new_id = AssetID(int(new_id) if new_id is not None else -1)  # -1 if steam broke?
+        """The new_assetid field, this is the asset ID of the item in the partners inventory."""
+        new_context_id = data.get("new_contextid") or data.get("rollback_new_contextid")
+        self.new_context_id = ContextID(
+            int(new_context_id) if new_context_id is not None else -1  # steam broke again probably
+        )
+        """The new_contextid field."""
 
-        try:
-            self.new_context_id = ContextID(
-                int(data["new_contextid"]) if "new_contextid" in data else int(data["rollback_new_contextid"])
-            )
-            """The new_contextid field."""
-        except KeyError:
-            self.new_context_id = ContextID(-1)  # steam broke again probably
+
+ACTIVE_STATES: Final = frozenset({TradeOfferState.Active, TradeOfferState.ConfirmationNeed})
+TradeAction: TypeAlias = Literal["accept", "decline", "cancel", "counter"]
+ACTION_RULES: Final[Mapping[TradeAction, tuple[tuple[TradeOfferState, str] | None, bool]]] = {
+    # (the state the offer is left in once the action has been taken and how to describe it if it's tried again,
+    #  whether the action can be taken on an offer the ClientUser made)
+    "accept": ((TradeOfferState.Accepted, "accepted"), False),
+    "decline": ((TradeOfferState.Declined, "declined"), False),
+    "cancel": ((TradeOfferState.Canceled, "cancelled"), True),
+    "counter": (None, False),
+}
 
 
 ReceivingAssetT = TypeVar("ReceivingAssetT", bound="Asset[PartialUser]", default="Item[User]", covariant=True)
@@ -371,11 +375,9 @@ class TradeOffer(Generic[ReceivingAssetT, SendingAssetT, UserT]):
         "id",
         "_id",
         "state",
-        "escrow",
         "user",
         "message",
         "token",
-        "expires",
         "updated_at",
         "created_at",
         "sending",
@@ -383,6 +385,8 @@ class TradeOffer(Generic[ReceivingAssetT, SendingAssetT, UserT]):
         "_has_been_sent",
         "_state",
         "_is_our_offer",
+        "_expires",
+        "_escrow_end",
     )
 
     id: TradeOfferID
@@ -415,14 +419,8 @@ class TradeOffer(Generic[ReceivingAssetT, SendingAssetT, UserT]):
         """The time at which the trade was last updated."""
         self.created_at: datetime | None = None
         """The time at which the trade was created."""
-        self.escrow: timedelta | None = None
-        """
-        The time at which the escrow will end. Can be ``None`` if there is no escrow on the trade.
-
-        Warning
-        -------
-        This isn't likely to be accurate, use :meth:`User.escrow` instead if possible.
-        """
+        self._expires: int | None = None
+        self._escrow_end: int | None = None
         self.state = TradeOfferState.Invalid
         """The offer state of the trade for the possible types see :class:`~steam.TradeOfferState`."""
         self._id: int | None = None
@@ -451,19 +449,19 @@ class TradeOffer(Generic[ReceivingAssetT, SendingAssetT, UserT]):
         cls: type[TradeOffer[MovedItem[UserT], MovedItem[ClientUser], UserT]],
         state: ConnectionState,
         data: trade.TradeOfferHistoryTrade,
-        descriptions: Sequence[trade.Description],
+        descriptions: Mapping[tuple[str, str], trade.Description],
     ) -> TradeOffer[MovedItem[UserT], MovedItem[ClientUser], UserT]:
         user = cast("UserT", state.get_partial_user(data["steamid_other"]))
         trade = cls(
             receiving=[
                 MovedItem(state, description | asset, user)
-                for asset, description in itertools.product(data.get("assets_received", ()), descriptions)
-                if description["instanceid"] == asset["instanceid"] and description["classid"] == asset["classid"]
+                for asset in data.get("assets_received", ())
+                if (description := descriptions.get((asset["classid"], asset["instanceid"]))) is not None
             ],
             sending=[
                 MovedItem(state, description | asset, state.user)
-                for asset, description in itertools.product(data.get("assets_given", ()), descriptions)
-                if description["instanceid"] == asset["instanceid"] and description["classid"] == asset["classid"]
+                for asset in data.get("assets_given", ())
+                if (description := descriptions.get((asset["classid"], asset["instanceid"]))) is not None
             ],
         )
         trade._state = state
@@ -515,13 +513,12 @@ class TradeOffer(Generic[ReceivingAssetT, SendingAssetT, UserT]):
     ) -> TradeOffer[Item[UserT], Item[ClientUser], UserT] | TradeOffer[Asset[UserT], Asset[ClientUser], UserT]:
         self.message = data.get("message") or None
         self.id = TradeOfferID(int(data["tradeofferid"]))
-        self._id = int(data["tradeid"]) if "tradeid" in data else None
-        expires = data.get("expiration_time")
-        escrow = data.get("escrow_end_date")
+        trade_id = data.get("tradeid")
+        self._id = int(trade_id) if trade_id is not None else None
+        self._expires = data.get("expiration_time") or None
+        self._escrow_end = data.get("escrow_end_date") or None
         updated_at = data.get("time_updated")
         created_at = data.get("time_created")
-        self.expires = DateTime.from_timestamp(expires) if expires else None
-        self.escrow = DateTime.from_timestamp(escrow) - DateTime.now() if escrow else None
         self.updated_at = DateTime.from_timestamp(updated_at) if updated_at else None
         self.created_at = DateTime.from_timestamp(created_at) if created_at else None
         self.state = TradeOfferState.try_value(data.get("trade_offer_state", 1))
@@ -529,23 +526,25 @@ class TradeOffer(Generic[ReceivingAssetT, SendingAssetT, UserT]):
         if (self.state != TradeOfferState.Accepted) and (
             sending or receiving
         ):  # steam doesn't really send the item data if the offer just got accepted
+            state = self._state
+            client_user = state.user
+            user = self.user
             try:
                 self.sending = [
-                    Item(self._state, asset=asset, description=description, owner=self._state.user)
+                    Item(state, asset=asset, description=description, owner=client_user)
                     for asset, description in cast("list[tuple[econ.Asset, econ.ItemDescription]]", sending)
                 ]
                 self.receiving = [
-                    Item(self._state, asset=asset, description=description, owner=self.user)
+                    Item(state, asset=asset, description=description, owner=user)
                     for asset, description in cast("list[tuple[econ.Asset, econ.ItemDescription]]", receiving)
                 ]
                 return cast("TradeOffer[Item[UserT], Item[ClientUser], UserT]", self)
             except ValueError:
                 self.sending = [
-                    Asset(self._state, asset=asset, owner=self._state.user)
-                    for asset in cast("list[econ.Asset]", sending)
+                    Asset(state, asset=asset, owner=client_user) for asset in cast("list[econ.Asset]", sending)
                 ]
                 self.receiving = [
-                    Asset(self._state, asset=asset, owner=self.user) for asset in cast("list[econ.Asset]", receiving)
+                    Asset(state, asset=asset, owner=user) for asset in cast("list[econ.Asset]", receiving)
                 ]
         return self
 
@@ -593,11 +592,7 @@ class TradeOffer(Generic[ReceivingAssetT, SendingAssetT, UserT]):
         steam.ConfirmationError
             No matching confirmation could not be found.
         """
-        if self.state == TradeOfferState.Accepted:
-            raise ClientException("This trade has already been accepted")
-        if self.is_our_offer():
-            raise ClientException("You cannot accept an offer the ClientUser has made")
-        self._check_active()
+        self._check("accept")
         assert self.user is not None
         resp = await self._state.http.accept_user_trade(self.user.id64, self.id)
         if resp.get("needs_mobile_confirmation", False):
@@ -611,11 +606,7 @@ class TradeOffer(Generic[ReceivingAssetT, SendingAssetT, UserT]):
         :exc:`~steam.ClientException`
             The trade is either not active, already declined or not from the ClientUser.
         """
-        if self.state == TradeOfferState.Declined:
-            raise ClientException("This trade has already been declined")
-        if self.is_our_offer():
-            raise ClientException("You cannot decline an offer the ClientUser has made")
-        self._check_active()
+        self._check("decline")
         await self._state.http.decline_user_trade(self.id)
 
     async def cancel(self) -> None:
@@ -626,9 +617,7 @@ class TradeOffer(Generic[ReceivingAssetT, SendingAssetT, UserT]):
         :exc:`~steam.ClientException`
             The trade is either not active or already cancelled.
         """
-        if self.state == TradeOfferState.Canceled:
-            raise ClientException("This trade has already been cancelled")
-        self._check_active()
+        self._check("cancel")
         await self._state.http.cancel_user_trade(self.id)
 
     async def receipt(self) -> TradeOfferReceipt[UserT]:
@@ -645,19 +634,21 @@ class TradeOffer(Generic[ReceivingAssetT, SendingAssetT, UserT]):
 
         data = await self._state.http.get_trade_receipt(self._id)
         (trade,) = data["trades"]
-        descriptions = data["descriptions"]
+        descriptions = {
+            (description["classid"], description["instanceid"]): description for description in data["descriptions"]
+        }
         assert self.user is not None
 
         return TradeOfferReceipt(
             sent=[
                 MovedItem(self._state, data={**description, **asset}, owner=self._state.user)
-                for asset, description in itertools.product(trade.get("assets_given", ()), descriptions)
-                if description["instanceid"] == asset["instanceid"] and description["classid"] == asset["classid"]
+                for asset in trade.get("assets_given", ())
+                if (description := descriptions.get((asset["classid"], asset["instanceid"]))) is not None
             ],
             received=[
                 MovedItem(self._state, data={**description, **asset}, owner=self.user)
-                for asset, description in itertools.product(trade.get("assets_received", ()), descriptions)
-                if description["instanceid"] == asset["instanceid"] and description["classid"] == asset["classid"]
+                for asset in trade.get("assets_received", ())
+                if (description := descriptions.get((asset["classid"], asset["instanceid"]))) is not None
             ],
         )
 
@@ -677,9 +668,7 @@ class TradeOffer(Generic[ReceivingAssetT, SendingAssetT, UserT]):
         :exc:`~steam.ClientException`
             The trade from the ClientUser or it isn't active.
         """
-        self._check_active()
-        if self.is_our_offer():
-            raise ClientException("You cannot counter an offer the ClientUser has made")
+        self._check("counter")
 
         assert self.user is not None
         await self.user._send_trade(trade, tradeofferid_countered=self.id)
@@ -689,6 +678,22 @@ class TradeOffer(Generic[ReceivingAssetT, SendingAssetT, UserT]):
         """The URL of the trade offer."""
         return str(URL.COMMUNITY / f"tradeoffer/{self.id}")
 
+    @property
+    def expires(self) -> datetime | None:
+        """The time at which the trade offer will expire."""
+        return DateTime.from_timestamp(self._expires) if self._expires else None
+
+    @property
+    def escrow(self) -> timedelta | None:
+        """
+        The time until the escrow will end. Can be ``None`` if there is no escrow on the trade.
+
+        Warning
+        -------
+        This isn't likely to be accurate, use :meth:`User.escrow` instead if possible.
+        """
+        return DateTime.from_timestamp(self._escrow_end) - DateTime.now() if self._escrow_end else None
+
     def is_gift(self) -> bool:
         """Helper method that checks if an offer is a gift to the :class:`~steam.ClientUser`"""
         return bool(self.receiving and not self.sending)
@@ -698,5 +703,15 @@ class TradeOffer(Generic[ReceivingAssetT, SendingAssetT, UserT]):
         return self._is_our_offer
 
     def _check_active(self) -> None:
-        if self.state not in (TradeOfferState.Active, TradeOfferState.ConfirmationNeed) or not self._has_been_sent:
+        if self.state not in ACTIVE_STATES or not self._has_been_sent:
             raise ClientException("This trade is not active")
+
+    def _check(self, action: TradeAction) -> None:
+        done, ours_allowed = ACTION_RULES[action]
+        if done is not None:
+            done_state, description = done
+            if self.state == done_state:
+                raise ClientException(f"This trade has already been {description}")
+        if not ours_allowed and self.is_our_offer():
+            raise ClientException(f"You cannot {action} an offer the ClientUser has made")
+        self._check_active()
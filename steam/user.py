@@ -27,14 +27,13 @@ if TYPE_CHECKING:
 
     from typing_extensions import Self
 
-    from .app import App
     from .channel import UserChannel
     from .friend import Friend
     from .media import Media
     from .message import UserMessage
     from .protobufs.friends import CMsgClientPersonaStateFriend as UserProto
     from .state import ConnectionState
-    from .trade import Asset, Inventory, Item, TradeOffer
+    from .trade import Asset, TradeOffer
 
 __all__ = (
     "User",
@@ -330,17 +329,6 @@ class ClientUser(_BaseUser):
         id32 = _ID64_TO_ID32(utils.parse_id64(id, type=Type.Individual))
         return self._friends.get(id32)
 
-    async def inventory(
-        self, app: App, *, context_id: int | None = None, language: Language | None = None
-    ) -> Inventory[Item[Self], Self]:
-        try:
-            lock = self._inventory_locks[app.id]
-        except KeyError:
-            lock = self._inventory_locks[app.id] = asyncio.Lock()
-
-        async with lock:  # requires a per-app lock to avoid Result.DuplicateRequest
-            return await super().inventory(app, context_id=context_id, language=language)
-
     async def setup_profile(self) -> None:
         """Set up your profile if possible."""
         params = {"welcomed": 1}
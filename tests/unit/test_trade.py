@@ -0,0 +1,350 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+import weakref
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+import steam
+from steam._const import TaskGroup
+from steam.protobufs import econ
+from steam.protobufs.friends import CMsgClientPersonaStateFriend
+from steam.state import Queue
+from tests.unit.mocks import USER
+from tests.unit.test_bot import bot
+
+
+def make_asset(asset_id: int, class_id: int, instance_id: int = 0) -> econ.Asset:
+    return econ.Asset(appid=440, contextid=2, assetid=asset_id, classid=class_id, instanceid=instance_id, amount=1)
+
+
+def make_description(class_id: int, instance_id: int = 0, name: str = "") -> econ.ItemDescription:
+    return econ.ItemDescription(
+        appid=440, classid=class_id, instanceid=instance_id, market_name=name or f"item {class_id}_{instance_id}"
+    )
+
+
+def make_inventory(
+    assets: list[econ.Asset], descriptions: list[econ.ItemDescription]
+) -> steam.Inventory[steam.Item[steam.User], steam.User]:
+    return steam.Inventory[steam.Item[steam.User], steam.User](
+        bot._state,
+        econ.GetInventoryItemsWithDescriptionsResponse(assets=assets, descriptions=descriptions),
+        USER,
+        steam.TF2,
+        steam.types.id.ContextID(2),
+        None,
+    )
+
+
+def test_inventory_matches_descriptions() -> None:
+    inventory = make_inventory(
+        [make_asset(1, 10), make_asset(2, 20, 5), make_asset(3, 10)],
+        [make_description(20, 5, "Key"), make_description(10, 0, "Metal"), make_description(20, 0, "Crate")],
+    )
+
+    assert [item.id for item in inventory] == [1, 2, 3]
+    assert [item.name for item in inventory] == ["Metal", "Key", "Metal"]
+    assert all(item.owner is USER for item in inventory)
+
+
+def test_empty_inventory() -> None:
+    inventory = make_inventory([], [])
+
+    assert inventory.items == []
+    assert not inventory
+
+
+def test_inventory_missing_description() -> None:
+    with pytest.raises(RuntimeError):
+        make_inventory([make_asset(1, 10)], [make_description(20)])
+
+
+def test_trade_from_history_matches_descriptions() -> None:
+    descriptions = {
+        (description["classid"], description["instanceid"]): description
+        for description in (
+            {"classid": "10", "instanceid": "0", "market_name": "Metal", "market_hash_name": "Metal"},
+            {"classid": "20", "instanceid": "5", "market_name": "Key", "market_hash_name": "Key"},
+        )
+    }
+    trade = steam.TradeOffer._from_history(
+        bot._state,
+        {
+            "tradeid": "1",
+            "steamid_other": "76561198248053954",
+            "time_init": 0,
+            "status": 3,
+            "assets_received": [
+                {
+                    "appid": 440,
+                    "contextid": "2",
+                    "assetid": "1",
+                    "classid": "20",
+                    "instanceid": "5",
+                    "amount": "1",
+                    "new_assetid": "100",
+                    "new_contextid": "2",
+                },
+                {"appid": 440, "contextid": "2", "assetid": "2", "classid": "30", "instanceid": "0", "amount": "1"},
+            ],
+            "assets_given": [],
+        },
+        descriptions,
+    )
+
+    assert [item.name for item in trade.receiving] == ["Key"]
+    assert [item.id for item in trade.receiving] == [1]
+    assert [(item.new_id, item.new_context_id) for item in trade.receiving] == [(100, 2)]
+    assert not trade.sending
+
+
+@pytest.mark.asyncio
+async def test_trade_queue_wait_for() -> None:
+    queue = Queue[SimpleNamespace]()
+    first, second, third = SimpleNamespace(id=1), SimpleNamespace(id=2), SimpleNamespace(id=1)
+    queue += [first, second, third]
+
+    assert await queue.wait_for(1) is third
+    assert await queue.wait_for(1) is first
+    assert [item for _, item in queue.queue] == [second]
+
+    waiter = asyncio.create_task(queue.wait_for(3))
+    await asyncio.sleep(0)
+    fourth = SimpleNamespace(id=3)
+    queue += [fourth]
+    assert await waiter is fourth
+    assert [item for _, item in queue.queue] == [second]
+
+
+@pytest.mark.asyncio
+async def test_queue_accepts_one_shot_iterables() -> None:
+    queue = Queue[SimpleNamespace]()
+    waiter = asyncio.create_task(queue.wait_for(2))
+    await asyncio.sleep(0)
+    queue += (SimpleNamespace(id=id) for id in range(3))
+
+    assert (await waiter).id == 2
+    assert [item.id for _, item in queue.queue] == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_trade_queue_keeps_sent_offer_until_waited_for() -> None:
+    queue = bot._state.trade_queue
+    sent = SimpleNamespace(id=1)
+    queue += [sent]  # polled whilst the offer is still being confirmed
+    for id in range(2, 500):  # plenty of unrelated updates before wait_for_trade gets called
+        queue += [SimpleNamespace(id=id)]
+
+    assert await asyncio.wait_for(queue.wait_for(1), 1) is sent
+    queue.queue.clear()
+
+
+def test_queue_expires_old_entries(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 0.0
+    monkeypatch.setattr(steam.state, "time", SimpleNamespace(monotonic=lambda: now))
+    queue = Queue[SimpleNamespace](ttl=10)
+    queue += [SimpleNamespace(id=1), SimpleNamespace(id=2)]
+
+    now = 5
+    queue += [SimpleNamespace(id=3)]
+    assert [item.id for _, item in queue.queue] == [1, 2, 3]
+
+    now = 11
+    queue += [SimpleNamespace(id=4)]
+    assert [item.id for _, item in queue.queue] == [3, 4]
+
+
+def make_trade_offer(**data: Any) -> steam.TradeOffer[steam.Item[steam.User], steam.Item[steam.ClientUser], steam.User]:
+    return steam.TradeOffer._from_api(
+        bot._state, {"tradeofferid": "1", "accountid_other": 1, "trade_offer_state": 2, **data}, [], [], USER
+    )
+
+
+@pytest.mark.parametrize(
+    "data, action, message",
+    [
+        ({"is_our_offer": True}, "accept", "You cannot accept an offer the ClientUser has made"),
+        ({"is_our_offer": True}, "decline", "You cannot decline an offer the ClientUser has made"),
+        ({"is_our_offer": True}, "counter", "You cannot counter an offer the ClientUser has made"),
+        ({"trade_offer_state": 3}, "accept", "This trade has already been accepted"),
+        ({"trade_offer_state": 7}, "decline", "This trade has already been declined"),
+        ({"trade_offer_state": 6, "is_our_offer": True}, "cancel", "This trade has already been cancelled"),
+        ({"trade_offer_state": 3, "is_our_offer": True}, "cancel", "This trade is not active"),
+        ({"trade_offer_state": 5}, "counter", "This trade is not active"),
+    ],
+)
+def test_trade_offer_action_checks(data: dict[str, Any], action: Any, message: str) -> None:
+    with pytest.raises(steam.ClientException, match=message):
+        make_trade_offer(**data)._check(action)
+
+
+def test_trade_offer_action_checks_pass() -> None:
+    make_trade_offer()._check("accept")
+    make_trade_offer(trade_offer_state=9)._check("decline")
+    make_trade_offer(is_our_offer=True)._check("cancel")
+    make_trade_offer()._check("cancel")
+
+
+def test_trade_offer_timestamps() -> None:
+    data = {
+        "tradeofferid": "1",
+        "accountid_other": 1,
+        "message": "",
+        "expiration_time": 1_700_000_000,
+        "escrow_end_date": 0,
+        "time_created": 1_600_000_000,
+        "time_updated": 1_600_000_000,
+        "trade_offer_state": 2,
+        "is_our_offer": False,
+    }
+    trade = steam.TradeOffer._from_api(bot._state, data, [], [], USER)
+
+    assert trade.expires == datetime.fromtimestamp(1_700_000_000, timezone.utc)
+    assert trade.created_at == datetime.fromtimestamp(1_600_000_000, timezone.utc)
+    assert trade.escrow is None
+    assert steam.TradeOffer().expires is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_inventory_fetches_are_coalesced(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = 0
+
+    async def fetch_user_inventory(*args: object) -> econ.GetInventoryItemsWithDescriptionsResponse:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        return econ.GetInventoryItemsWithDescriptionsResponse(assets=[make_asset(calls, 10)])
+
+    state = bot._state
+    monkeypatch.setattr(state, "_fetch_user_inventory", fetch_user_inventory)
+    args = (USER.id64, steam.TF2.id, steam.types.id.ContextID(2), None)
+    async with TaskGroup() as tg:
+        monkeypatch.setattr(bot, "_tg", tg, raising=False)
+        first, second = await asyncio.gather(state.fetch_user_inventory(*args), state.fetch_user_inventory(*args))
+
+        assert calls == 1
+        assert first is second
+        assert not state._inventory_requests
+
+        # a re-fetch doesn't reuse the response already in flight, but later plain fetches join the re-fetch
+        first, fresh, joined = await asyncio.gather(
+            state.fetch_user_inventory(*args),
+            state.fetch_user_inventory(*args, fresh=True),
+            state.fetch_user_inventory(*args),
+        )
+        assert calls == 3
+        assert first is not fresh
+        assert fresh is joined
+        assert not state._inventory_requests
+
+
+@pytest.mark.asyncio
+async def test_failed_inventory_fetch_is_raised_to_the_caller(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def fetch_user_inventory(*args: object) -> econ.GetInventoryItemsWithDescriptionsResponse:
+        await asyncio.sleep(0)
+        raise steam.ClientException("inventory is private")
+
+    state = bot._state
+    monkeypatch.setattr(state, "_fetch_user_inventory", fetch_user_inventory)
+    args = (USER.id64, steam.TF2.id, steam.types.id.ContextID(2), None)
+    async with TaskGroup() as tg:
+        monkeypatch.setattr(bot, "_tg", tg, raising=False)
+        with pytest.raises(steam.ClientException, match="inventory is private"):
+            await state.fetch_user_inventory(*args)
+
+        requests = state._inventory_requests
+        pending = asyncio.create_task(state.fetch_user_inventory(*args))
+        await asyncio.sleep(0)
+        newer = state._inventory_requests = {
+            args[:3] + (state.language,): asyncio.get_running_loop().create_future()
+        }  # as if clear() ran
+        with pytest.raises(steam.ClientException, match="inventory is private"):
+            await pending
+        assert not requests
+        assert state._inventory_requests is newer and len(newer) == 1
+        state._inventory_requests = requests
+
+
+def test_asset_equality() -> None:
+    asset = steam.Asset(bot._state, make_asset(1, 10), USER)
+    same_asset = steam.Asset(bot._state, make_asset(1, 20, 5), USER)
+    other_asset = steam.Asset(bot._state, make_asset(2, 10), USER)
+    item = steam.Item(bot._state, make_asset(1, 10), make_description(10), USER)
+
+    assert asset == same_asset == item
+    assert asset != other_asset
+    assert len({asset, same_asset, other_asset, item}) == 2
+
+
+def test_item_apps_are_shared() -> None:
+    inventory = make_inventory([make_asset(1, 10), make_asset(2, 20)], [make_description(10), make_description(20)])
+    first, second = inventory
+
+    assert first.app is second.app
+    assert first.app == steam.TF2
+
+
+def test_item_apps_dont_keep_state_alive() -> None:
+    client = steam.Client()
+    state = weakref.ref(client._state)
+    item = steam.Item(client._state, make_asset(1, 10), make_description(10), USER)
+    assert item.app is item.app
+    del client, item
+    gc.collect()
+
+    assert state() is None
+
+
+@pytest.mark.asyncio
+async def test_trade_partners_are_kept_alive_for_a_while(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 0.0
+    monkeypatch.setattr(steam.state, "time", SimpleNamespace(monotonic=lambda: now))
+    friend_ids = (76561198248053954, 76561198248053955)
+
+    async def fetch_users(user_id64s: object) -> list[CMsgClientPersonaStateFriend]:
+        return [CMsgClientPersonaStateFriend(friendid=id, player_name="partner") for id in friend_ids]
+
+    client = steam.Client()
+    client.ws = SimpleNamespace(fetch_users=fetch_users)  # type: ignore
+    state = client._state
+    partner, other = await state.fetch_users(friend_ids)
+    partner_id, other_id = partner.id, other.id
+    state._keep_trade_partners_alive([partner])
+    del partner, other
+    gc.collect()
+    assert state.get_user(partner_id) is not None
+    assert state.get_user(other_id) is None  # plain fetches aren't held onto
+
+    now = 200
+    state._keep_trade_partners_alive([state.get_user(partner_id)])  # seen again, refreshes the expiry
+    assert len(state._recent_trade_partners) == 1
+
+    now = 400
+    state._expire_trade_partners()
+    gc.collect()
+    assert state.get_user(partner_id) is not None
+
+    now = 600
+    state._expire_trade_partners()
+    gc.collect()
+    assert state.get_user(partner_id) is None
+    assert state._trade_partners_expiry is None
+
+
+@pytest.mark.asyncio
+async def test_trade_partner_cache_is_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(steam.state, "USER_CACHE_SIZE", 2)
+    state = steam.Client()._state
+    users = [SimpleNamespace(id=id) for id in range(4)]
+    state._keep_trade_partners_alive(users)  # type: ignore
+
+    assert list(state._recent_trade_partners) == [2, 3]
+    expiry = state._trade_partners_expiry
+    state.clear()
+    assert expiry is not None and expiry.cancelled()
+    assert not state._recent_trade_partners